@@ -0,0 +1,228 @@
+import asyncio
+import multiprocessing
+import signal
+import threading
+import weakref
+
+from calendar_puzzle import DEFAULT_PUZZLE, PROGRESS_INTERVAL, CalendarPuzzle
+from puzzle_definition import load_puzzle_definition
+
+# Event kinds
+EVENT_PROGRESS = "progress"
+EVENT_SOLUTION = "solution"
+EVENT_DONE = "done"
+
+EVENT_QUEUE_SIZE = 16  # Events buffered before the search waits for the consumer
+STOP_POLL_INTERVAL = 0.1  # Seconds between stop checks while the search waits for the consumer
+
+_FINISHED = object()  # Queue sentinel put by the reader thread when the search process exits
+
+
+class SolveEvent:
+    """
+    One event of a streaming solve.
+    kind: EVENT_PROGRESS, EVENT_SOLUTION or EVENT_DONE
+    solution: the Solution found (EVENT_SOLUTION only)
+    solutions_found: solutions found so far
+    search_stats: copy of the solver's search_stats at the time of the event
+    truncated: the search ended early, at max_solutions or because it was stopped (EVENT_DONE only)
+    """
+    __slots__ = ("kind", "solution", "solutions_found", "search_stats", "truncated")
+
+    def __init__(self, kind, solutions_found, search_stats, solution=None, truncated=False):
+        self.kind = kind
+        self.solution = solution
+        self.solutions_found = solutions_found
+        self.search_stats = search_stats
+        self.truncated = truncated
+
+    def __repr__(self):
+        return f"SolveEvent({self.kind!r}, solutions_found={self.solutions_found})"
+
+
+def _solve_process(definition_path, target_cells, max_solutions, progress_interval, conn, credits, stop_event):
+    """
+    Search process body: solve and send SolveEvents through conn.
+    Each event takes one of the consumer's credits, so the search only waits
+    when the consumer's queue is full; an exception is sent in place of EVENT_DONE.
+    """
+    # Ctrl+C is handled by the parent, which sets stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    puzzle = None
+
+    def emit(event):
+        while not credits.acquire(timeout=STOP_POLL_INTERVAL):
+            if stop_event.is_set():
+                # Nobody is waiting for the event any more
+                puzzle.request_stop()
+                return
+        conn.send(event)
+
+    def on_solution(solution):
+        emit(SolveEvent(EVENT_SOLUTION, len(puzzle.solutions), dict(puzzle.search_stats), solution=solution))
+
+    def on_progress(search_stats):
+        if stop_event.is_set():
+            puzzle.request_stop()
+        else:
+            emit(SolveEvent(EVENT_PROGRESS, len(puzzle.solutions), search_stats))
+
+    try:
+        puzzle = CalendarPuzzle(load_puzzle_definition(definition_path))
+        puzzle.MAX_SOLUTIONS = max_solutions
+        puzzle.progress_interval = progress_interval
+        for r, c in target_cells:
+            puzzle.toggle_target_cell(r, c)
+        puzzle.solution_callback = on_solution
+        puzzle.progress_callback = on_progress
+        if not stop_event.is_set():
+            puzzle.solve()
+        truncated = stop_event.is_set() or len(puzzle.solutions) >= puzzle.MAX_SOLUTIONS
+        emit(SolveEvent(EVENT_DONE, len(puzzle.solutions), dict(puzzle.search_stats), truncated=truncated))
+    except BrokenPipeError:
+        pass  # The consumer's process is gone
+    except Exception as e:
+        conn.send(e)
+    finally:
+        conn.close()
+
+
+def _forward_events(conn, process, loop, queue):
+    """
+    Reader thread body: move items sent by the search process onto the event queue,
+    then put the end-of-stream item (_FINISHED or the search's exception).
+    The thread only waits on the pipe, so it barely competes with the loop for the GIL.
+    """
+    error = None
+    try:
+        while True:
+            item = conn.recv()
+            if isinstance(item, BaseException):
+                error = item
+            else:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+    except EOFError:
+        pass
+    except RuntimeError:
+        return  # The loop has been closed; the search stops once it misses its consumer
+    finally:
+        conn.close()
+    process.join()
+    if error is None and process.exitcode:
+        error = RuntimeError(f"search process exited with code {process.exitcode}")
+    try:
+        loop.call_soon_threadsafe(queue.put_nowait, error or _FINISHED)
+    except RuntimeError:
+        pass
+
+
+class AsyncSolve:
+    """
+    Solve for a set of target cells in a separate process, streaming SolveEvents
+    through a bounded queue. When the queue is full the search waits for the
+    consumer, so a slow consumer slows the search instead of growing memory.
+    The search runs outside this process, so concurrent solves don't hold the
+    event loop's GIL.
+
+    Use as an async iterator, preferably inside ``async with`` so that leaving
+    early stops the search at once; an iterator that is abandoned stops its
+    search when it is garbage collected.
+
+        async with AsyncSolve(target_cells) as events:
+            async for event in events:
+                ...
+    """
+    def __init__(self, target_cells, definition=None, max_solutions=CalendarPuzzle.MAX_SOLUTIONS,
+                 progress_interval=PROGRESS_INTERVAL, queue_size=EVENT_QUEUE_SIZE, mp_context=None):
+        self.definition = definition or DEFAULT_PUZZLE
+        self.target_cells = list(target_cells)
+        self.max_solutions = max_solutions if max_solutions is not None else float('inf')
+        self.progress_interval = progress_interval
+        self.queue_size = queue_size
+        self.solutions = []  # Solutions received so far
+        self.search_stats = None  # As of the latest event
+        self._context = mp_context or multiprocessing.get_context()
+        self._stop_event = self._context.Event()
+        # Stop the search if the iterator is dropped without aclose()
+        weakref.finalize(self, self._stop_event.set)
+        self._queue = None
+        self._credits = None
+        self._process = None
+        self._finished = False
+        self._closed = False
+
+    def _start(self):
+        loop = asyncio.get_running_loop()
+        # One slot beyond the credits for the end-of-stream item
+        self._queue = asyncio.Queue(self.queue_size + 1)
+        self._credits = self._context.Semaphore(self.queue_size)
+        reader, writer = self._context.Pipe(duplex=False)
+        self._process = self._context.Process(
+            target=_solve_process, daemon=True,
+            args=(self.definition.source_path, self.target_cells, self.max_solutions, self.progress_interval,
+                  writer, self._credits, self._stop_event))
+        self._process.start()
+        writer.close()
+        # The thread must not reference self, or an abandoned iterator would never be collected
+        threading.Thread(target=_forward_events, args=(reader, self._process, loop, self._queue),
+                         daemon=True).start()
+
+    async def _next_item(self):
+        """
+        Return the next event, or None at the end of the stream.
+        Re-raises an exception from the search process.
+        """
+        item = await self._queue.get()
+        if item is _FINISHED or isinstance(item, BaseException):
+            self._finished = True
+            if item is not _FINISHED:
+                raise item
+            return None
+        self._credits.release()
+        if item.kind == EVENT_SOLUTION:
+            self.solutions.append(item.solution)
+        self.search_stats = item.search_stats
+        return item
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._finished or self._closed:
+            raise StopAsyncIteration
+        if self._process is None:
+            self._start()
+        event = await self._next_item()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+    async def aclose(self):
+        """
+        Stop the search if it is still running and wait for its process to exit.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._stop_event.set()
+        if self._process is None:
+            return
+        while not self._finished:
+            await self._next_item()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+
+async def solve_async(target_cells, definition=None, max_solutions=CalendarPuzzle.MAX_SOLUTIONS, mp_context=None):
+    """
+    Solve for a set of target cells without blocking the event loop.
+    Returns (solutions, search_stats).
+    """
+    async with AsyncSolve(target_cells, definition, max_solutions, mp_context=mp_context) as events:
+        async for _ in events:
+            pass
+        return events.solutions, events.search_stats
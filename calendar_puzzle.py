@@ -4,54 +4,54 @@ import sys
 import calendar
 import datetime
 import collections
-
+import multiprocessing
+import os
+import pickle
+import signal
+import threading
+import time
+from array import array
+
+from puzzle_definition import (
+    CELL_TYPE_DAY,
+    CELL_TYPE_MONTH,
+    CELL_TYPE_NAMES,
+    CELL_TYPE_WEEKDAY,
+    get_piece_variations,
+    load_puzzle_definition,
+)
+
+
+# Puzzle definition (board shape, labels and pieces) compiled from puzzles/classic.json
+DEFAULT_PUZZLE = load_puzzle_definition()
 
 # Board Configuration
-BOARD_ROWS = 8
-BOARD_COLS = 7
+BOARD_ROWS = DEFAULT_PUZZLE.rows
+BOARD_COLS = DEFAULT_PUZZLE.cols
 TILE_SIZE = 70
 MARGIN = 5
 INFO_HEIGHT = 100
 
+# Background solving
+SOLUTION_CACHE_SIZE = 32  # Target-cell sets whose solutions are kept
+PREFETCH_WORKERS = 2
+PREFETCH_DAYS = 3  # Upcoming days solved after today at startup
+PREFETCH_HOVER = True  # Solve the selection a hovered cell would complete
+MAX_PENDING_HOVER_PREFETCHES = 2
+
+# Search checkpoints
+CHECKPOINT_VERSION = 1  # Bump whenever the checkpoint layout changes
+CHECKPOINT_INTERVAL = 60  # Seconds between checkpoints
+PROGRESS_INTERVAL = 0.1  # Seconds between progress_callback calls
+
 # Restricted Areas
-RESTRICTED_CELLS = [
-    (0, 6), (1, 6),  # First and second rows, last column
-    (7, 0), (7, 1), (7, 2), (7, 3)  # Last row, first four columns
-]
+RESTRICTED_CELLS = DEFAULT_PUZZLE.restricted_cells
 
 # Cell Labels
-CELL_LABELS = {
-    # First row: Months
-    (0, 0): "Jan", (0, 1): "Feb", (0, 2): "Mar", (0, 3): "Apr", (0, 4): "May", (0, 5): "Jun", (0, 6): "",
-    # Second row: Months
-    (1, 0): "Jul", (1, 1): "Aug", (1, 2): "Sep", (1, 3): "Oct", (1, 4): "Nov", (1, 5): "Dec", (1, 6): "",
-    # Third row: Dates
-    (2, 0): "1", (2, 1): "2", (2, 2): "3", (2, 3): "4", (2, 4): "5", (2, 5): "6", (2, 6): "7",
-    # Fourth row: Dates
-    (3, 0): "8", (3, 1): "9", (3, 2): "10", (3, 3): "11", (3, 4): "12", (3, 5): "13", (3, 6): "14",
-    # Fifth row: Dates
-    (4, 0): "15", (4, 1): "16", (4, 2): "17", (4, 3): "18", (4, 4): "19", (4, 5): "20", (4, 6): "21",
-    # Sixth row: Dates
-    (5, 0): "22", (5, 1): "23", (5, 2): "24", (5, 3): "25", (5, 4): "26", (5, 5): "27", (5, 6): "28",
-    # Seventh row: Dates and Weekdays
-    (6, 0): "29", (6, 1): "30", (6, 2): "31", (6, 3): "Sun", (6, 4): "Mon", (6, 5): "Tues", (6, 6): "Wed",
-    # Eighth row: Weekdays
-    (7, 0): "", (7, 1): "", (7, 2): "", (7, 3): "", (7, 4): "Thur", (7, 5): "Fri", (7, 6): "Sat",
-}
+CELL_LABELS = DEFAULT_PUZZLE.cell_labels
 
 # Puzzle Pieces
-PUZZLE_PIECES = [
-    [(0,0), (0,1), (0,2), (1,2), (2,2)], # L-shape
-    [(0,0), (0,1), (0,2), (1,1), (2,1)], # T-shape
-    [(0,0), (0,1), (1,1), (2,1), (2,2)], # Z-shape
-    [(0,0), (0,1), (0,2), (1,0), (1,2)], # U-shape
-    [(0,0), (0,1), (0,2), (1,0), (1,1)], # L-shape
-    [(0,0), (0,1), (0,2), (1,2), (1,3)], # Long L-shape
-    [(0,0), (0,1), (0,2), (0,3), (1,0)], # Long bar
-    [(0,0), (1,0), (2,0), (3,0)], # Vertical bar
-    [(0,0), (1,0), (2,0), (2,1)], # Small L-shape
-    [(0,0), (1,0), (1,1), (2,1)] # Z-shape
-]
+PUZZLE_PIECES = DEFAULT_PUZZLE.pieces
 
 # Colors
 BASE_PIECE_COLORS = [
@@ -76,11 +76,61 @@ INFO_AREA_BACKGROUND_COLOR = (200, 200, 200)  # Gray
 INFO_AREA_TEXT_COLOR = (0, 0, 0)  # Black
 LABEL_TEXT_COLOR = (50, 50, 50)  # Dark gray
 
-PIECE_COLORS = [BASE_PIECE_COLORS[i % len(BASE_PIECE_COLORS)] for i in range(len(PUZZLE_PIECES))]
+def get_piece_colors(num_pieces):
+    """Cycle the base palette to give every piece a color."""
+    return [BASE_PIECE_COLORS[i % len(BASE_PIECE_COLORS)] for i in range(num_pieces)]
+
+PIECE_COLORS = get_piece_colors(len(PUZZLE_PIECES))
 TARGET_CELL_COLOR = (128, 128, 128)  # Gray
 SELECTED_PIECE_BORDER_COLOR = (0, 255, 0)  # Green
 RESTRICTED_CELL_COLOR = SCREEN_BACKGROUND_COLOR  # Same as background color
 
+class Solution:
+    """
+    Immutable solution: placement_ids[piece_idx] is the index of the piece's
+    placement in the compiled placement table (None for empty pieces).
+    """
+    __slots__ = ("placement_ids",)
+
+    def __init__(self, placement_ids):
+        object.__setattr__(self, "placement_ids", tuple(placement_ids))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Solution is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Solution is immutable")
+
+    def __reduce__(self):
+        return (Solution, (self.placement_ids,))
+
+    def __eq__(self, other):
+        return isinstance(other, Solution) and self.placement_ids == other.placement_ids
+
+    def __hash__(self):
+        return hash(self.placement_ids)
+
+    def __repr__(self):
+        return f"Solution({self.placement_ids!r})"
+
+class SearchFrame:
+    """
+    One branching node of the iterative search: the placements propagation
+    forced at this node, the piece being branched on, its legal placements,
+    the position of the next one to try and the one currently placed.
+    """
+    __slots__ = ("forced", "piece_idx", "legal", "next_pos", "current")
+
+    def __init__(self, forced, piece_idx, legal, next_pos=0, current=None):
+        self.forced = forced
+        self.piece_idx = piece_idx
+        self.legal = legal
+        self.next_pos = next_pos
+        self.current = current
+
+    def to_tuple(self):
+        return (self.forced, self.piece_idx, self.legal, self.next_pos, self.current)
+
 class CalendarPuzzle:
     """
     Main class for the calendar puzzle game.
@@ -93,36 +143,60 @@ class CalendarPuzzle:
     # Piece IDs will be 1 through len(PUZZLE_PIECES)
 
     # Cell type constants
-    CELL_TYPE_MONTH = 0
-    CELL_TYPE_DAY = 1
-    CELL_TYPE_WEEKDAY = 2
+    CELL_TYPE_MONTH = CELL_TYPE_MONTH
+    CELL_TYPE_DAY = CELL_TYPE_DAY
+    CELL_TYPE_WEEKDAY = CELL_TYPE_WEEKDAY
 
     # Maximum number of solutions to find
     MAX_SOLUTIONS = 10
 
-    def __init__(self):
+    def __init__(self, definition=None):
         """
         Initialize the puzzle board and game state.
+        definition is a CompiledPuzzle; the classic calendar is used by default.
         """
-        self.rows = BOARD_ROWS
-        self.cols = BOARD_COLS
-        self.board = [[self.EMPTY_CELL for _ in range(self.cols)] for _ in range(self.rows)]
-        self._initialize_restricted_areas()
+        self.definition = definition or DEFAULT_PUZZLE
+        self.rows = self.definition.rows
+        self.cols = self.definition.cols
+        self.restricted_cells = set(self.definition.restricted_cells)
+        self.cell_labels = self.definition.cell_labels
+        self.target_types = self.definition.target_types
+        # Board rows are arrays; resets copy the template rows in place
+        self.board_template = self._create_board_template()
+        self.board = [array('b', row) for row in self.board_template]
         self.target_cells_coords = []
         self.target_cells_types = []
-        self.max_target_cells = 3
-        self.puzzle_pieces_definitions = PUZZLE_PIECES
-        self.placed_pieces_info = {}
+        self.max_target_cells = len(self.target_types)
+        self.puzzle_pieces_definitions = self.definition.pieces
+        self.piece_placements = self.definition.piece_placements
+        self.placed_placement_ids = [None] * len(self.puzzle_pieces_definitions)
+        self.applied_solution = None  # Solution currently shown on the board, if any
+        # Bitmask state used by constraint propagation (bit r * cols + c)
+        self.placement_masks = [[mask for _, mask in placements] for placements in self.piece_placements]
+        self.full_mask = (1 << (self.rows * self.cols)) - 1
+        self.restricted_mask = sum(1 << (r * self.cols + c) for r, c in self.restricted_cells)
+        self.occupied_mask = self.restricted_mask
+        self.pieces_area = sum(len(piece) for piece in self.puzzle_pieces_definitions)
         self.is_solved_state = False
-        self.current_status_message = "Select: month, day, weekday"
+        self.current_status_message = self._selection_prompt()
         self.min_piece_size = self._calculate_min_piece_size()
         self.solutions = []
         self.current_solution_index = -1
-
-    def _initialize_restricted_areas(self):
-        """Initialize restricted areas on the board."""
-        for r, c in RESTRICTED_CELLS:
-            self.board[r][c] = self.RESTRICTED_CELL
+        self.search_stats = self._new_search_stats()
+        self.search_stack = []  # SearchFrames of the running or interrupted search
+        # Optional search hooks, called from the thread running solve()
+        self.solution_callback = None  # Called with each Solution as it is found
+        self.progress_callback = None  # Called with a copy of search_stats every progress_interval seconds
+        self.progress_interval = PROGRESS_INTERVAL
+        self.stop_requested = False  # Set by request_stop() to end the running search early
+        self.resumed_from_checkpoint = False  # Whether the last solve() continued a saved search
+
+    def _create_board_template(self):
+        """Create the empty board rows with restricted areas marked."""
+        template = [array('b', [self.EMPTY_CELL] * self.cols) for _ in range(self.rows)]
+        for r, c in self.restricted_cells:
+            template[r][c] = self.RESTRICTED_CELL
+        return tuple(template)
 
     def _calculate_min_piece_size(self):
         """
@@ -136,14 +210,29 @@ class CalendarPuzzle:
         """
         Determine the type of cell at the given coordinates.
         """
-        if r < 2:  # First two rows are months
-            return self.CELL_TYPE_MONTH
-        elif r < 6:  # Rows 2-5 are days
-            return self.CELL_TYPE_DAY
-        elif r == 6:  # Row 6 contains both days and weekdays
-            return self.CELL_TYPE_DAY if c < 3 else self.CELL_TYPE_WEEKDAY
-        else:  # Row 7 contains weekdays
-            return self.CELL_TYPE_WEEKDAY if c >= 4 else None
+        return self.definition.get_cell_type(r, c)
+
+    @staticmethod
+    def _new_search_stats():
+        """
+        Counters describing the effort of the last solve.
+        nodes: placements branched on, backtracks: dead ends (placements rejected
+        by pruning or nodes where propagation left some piece or cell uncoverable).
+        """
+        return {
+            'nodes': 0,
+            'backtracks': 0,
+            'forced': 0,  # Placements committed by propagation without branching
+            'first_solution_time': None,  # Seconds from solve start, None if no solution
+            'solve_time': 0.0,
+        }
+
+    def _selection_prompt(self):
+        """
+        Status message listing the cell types still to be selected.
+        """
+        remaining_types = [t for t in self.target_types if t not in self.target_cells_types]
+        return f"Select: {', '.join(CELL_TYPE_NAMES[t] for t in remaining_types)}"
 
     def toggle_target_cell(self, r, c):
         """
@@ -157,7 +246,9 @@ class CalendarPuzzle:
             
         coord = (r, c)
         cell_type = self._get_cell_type(r, c)
-                   
+        if cell_type is None:
+            return False
+
         # Check if we already have this type of cell selected
         if cell_type in self.target_cells_types:
             # Replace existing cell of same type
@@ -182,55 +273,28 @@ class CalendarPuzzle:
         if len(self.target_cells_coords) == self.max_target_cells:
             self.current_status_message = "Press 'S' to solve"
         else:
-            # Get remaining types to select
-            remaining_types = set(range(3)) - set(self.target_cells_types)
-            type_names = ['month' if self.CELL_TYPE_MONTH in remaining_types else '',
-                         'day' if self.CELL_TYPE_DAY in remaining_types else '',
-                         'weekday' if self.CELL_TYPE_WEEKDAY in remaining_types else '']
-            type_names = [t for t in type_names if t]  # Remove empty strings
-            
-            self.current_status_message = f"Select: {', '.join(type_names)}"
+            self.current_status_message = self._selection_prompt()
         return True
 
+    def preview_target_cells(self, r, c):
+        """
+        Target cells that selecting (r, c) would give, or None if that would not
+        complete the selection. The board is not changed.
+        """
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            return None
+        cell_type = self._get_cell_type(r, c)
+        if cell_type is None or self.board[r][c] == self.RESTRICTED_CELL:
+            return None
+        target_cells = [coord for coord, t in zip(self.target_cells_coords, self.target_cells_types) if t != cell_type]
+        target_cells.append((r, c))
+        return target_cells if len(target_cells) == self.max_target_cells else None
+
     def get_piece_variations(self, piece_coords):
         """
         Generate all unique variations of a puzzle piece.
         """
-        variations = []
-        current_piece_normalized = list(piece_coords)
-
-        for _ in range(2):  # Original and flipped versions
-            if not current_piece_normalized:
-                if [] not in variations:
-                    variations.append([])
-                continue
-
-            # Normalize the current shape
-            min_r = min(p[0] for p in current_piece_normalized)
-            min_c = min(p[1] for p in current_piece_normalized)
-            current_piece_normalized = sorted([(r - min_r, c - min_c) for r, c in current_piece_normalized])
-
-            # Generate rotations
-            for _ in range(4):
-                if current_piece_normalized not in variations:
-                    variations.append(current_piece_normalized)
-
-                if not current_piece_normalized:
-                    break
-
-                max_r = max(p[0] for p in current_piece_normalized)
-                rotated_piece = [(c, max_r - r) for r, c in current_piece_normalized]
-                min_r = min(p[0] for p in rotated_piece)
-                min_c = min(p[1] for p in rotated_piece)
-                current_piece_normalized = sorted([(r - min_r, c - min_c) for r, c in rotated_piece])
-
-            # Prepare for flip
-            if not piece_coords:
-                continue
-            max_c = max(p[1] for p in piece_coords)
-            current_piece_normalized = [(r, max_c - c) for r, c in piece_coords]
-
-        return variations
+        return get_piece_variations(piece_coords)
 
     def can_place_piece(self, piece_variation_coords, r_offset, c_offset):
         """Check if a piece can be placed at the given position."""
@@ -242,24 +306,30 @@ class CalendarPuzzle:
                 return False
         return True
 
-    def _place_or_remove_piece_on_board(self, piece_idx, piece_variation_coords, r_offset, c_offset, place=True):
+    def _place_or_remove_placement(self, piece_idx, placement_id, place=True):
         """
-        Place or remove a piece on the board.
+        Place or remove one of a piece's precompiled placements on the board.
         """
         piece_id_on_board = (piece_idx + 1) if place else self.EMPTY_CELL
-        affected_cells = []
-        for pr, pc in piece_variation_coords:
-            board_r, board_c = r_offset + pr, c_offset + pc
-            self.board[board_r][board_c] = piece_id_on_board
-            affected_cells.append((board_r, board_c))
-
+        board = self.board
+        cells, mask = self.piece_placements[piece_idx][placement_id]
+        for board_r, board_c in cells:
+            board[board_r][board_c] = piece_id_on_board
+        self.placed_placement_ids[piece_idx] = placement_id if place else None
         if place:
-            self.placed_pieces_info[piece_idx] = {
-                'coords_on_board': affected_cells,
-                'id_on_board': piece_id_on_board
-            }
-        elif piece_idx in self.placed_pieces_info:
-            del self.placed_pieces_info[piece_idx]
+            self.occupied_mask |= mask
+        else:
+            self.occupied_mask &= ~mask
+
+    def solution_cells(self, solution):
+        """
+        Map each placed piece of a solution to the board cells it covers.
+        """
+        return {
+            piece_idx: list(self.piece_placements[piece_idx][placement_id][0])
+            for piece_idx, placement_id in enumerate(solution.placement_ids)
+            if placement_id is not None
+        }
 
     def _is_valid_pruning_candidate(self):
         """Check if the current board state is valid for pruning."""
@@ -289,65 +359,287 @@ class CalendarPuzzle:
                         return False
         return True
 
-    def _solve_recursive(self, piece_idx_to_place):
-        """Recursive backtracking solver."""
-        if piece_idx_to_place == len(self.puzzle_pieces_definitions):
-            self.solutions.append(self.placed_pieces_info.copy())
-            return len(self.solutions) >= self.MAX_SOLUTIONS
-
-        original_piece_coords = self.puzzle_pieces_definitions[piece_idx_to_place]
-        if not original_piece_coords:
-            return self._solve_recursive(piece_idx_to_place + 1)
-
-        piece_variations = self.get_piece_variations(original_piece_coords)
-        found_solution = False
-
-        for r_offset in range(self.rows):
-            for c_offset in range(self.cols):
-                for variation_coords in piece_variations:
-                    if self.can_place_piece(variation_coords, r_offset, c_offset):
-                        self._place_or_remove_piece_on_board(piece_idx_to_place, variation_coords, r_offset, c_offset, True)
-                        
-                        if self._is_valid_pruning_candidate():
-                            if self._solve_recursive(piece_idx_to_place + 1):
-                                found_solution = True
-                                if len(self.solutions) >= self.MAX_SOLUTIONS:
-                                    return True
-                        
-                        self._place_or_remove_piece_on_board(piece_idx_to_place, variation_coords, r_offset, c_offset, False)
-
-        return found_solution
-
-    def solve(self):
+    def _propagate(self):
+        """
+        Commit placements forced by the current board until none remain.
+        A piece with a single legal placement is forced; when the empty cells must
+        be covered exactly, so is the only placement covering a cell.
+        Returns (forced, legal): the (piece_idx, placement_id) pairs committed and the
+        legal placement ids of every unplaced piece, or None as legal on a dead end.
+        """
+        forced = []
+        pieces = self.puzzle_pieces_definitions
+        placement_masks = self.placement_masks
+        placed = self.placed_placement_ids
+        # Every empty cell must be covered only if the remaining pieces fill them exactly
+        exact_cover = bin(self.full_mask & ~self.occupied_mask).count('1') == self.pieces_area - sum(
+            len(pieces[i]) for i, placement_id in enumerate(placed) if placement_id is not None)
+
+        while True:
+            occupied = self.occupied_mask
+            legal = {}
+            covered_once = covered_twice = 0
+            forced_piece = None
+            for piece_idx, piece in enumerate(pieces):
+                if not piece or placed[piece_idx] is not None:
+                    continue
+                masks = placement_masks[piece_idx]
+                legal_ids = [placement_id for placement_id, mask in enumerate(masks) if not mask & occupied]
+                if not legal_ids:
+                    return forced, None
+                if len(legal_ids) == 1:
+                    forced_piece = (piece_idx, legal_ids[0])
+                    break
+                legal[piece_idx] = legal_ids
+                for placement_id in legal_ids:
+                    mask = masks[placement_id]
+                    covered_twice |= covered_once & mask
+                    covered_once |= mask
+
+            if forced_piece is None and exact_cover and legal:
+                empty = self.full_mask & ~occupied
+                if empty & ~covered_once:
+                    return forced, None  # Some empty cell can no longer be covered
+                single = empty & ~covered_twice
+                if single:
+                    cell_bit = single & -single
+                    forced_piece = next((piece_idx, placement_id)
+                                        for piece_idx, legal_ids in legal.items()
+                                        for placement_id in legal_ids
+                                        if placement_masks[piece_idx][placement_id] & cell_bit)
+
+            if forced_piece is None:
+                return forced, legal
+            self._place_or_remove_placement(forced_piece[0], forced_piece[1], True)
+            forced.append(forced_piece)
+            self.search_stats['forced'] += 1
+
+    def _undo_placements(self, placements):
+        """Remove (piece_idx, placement_id) placements in reverse order."""
+        for piece_idx, placement_id in reversed(placements):
+            self._place_or_remove_placement(piece_idx, placement_id, False)
+
+    def _expand_node(self, piece_idx_to_place):
+        """
+        Propagate at a new search node and push it on the search stack, or
+        record a solution if every piece is placed. Dead ends are undone.
+        """
+        forced, legal = self._propagate()
+        if legal is None:
+            self.search_stats['backtracks'] += 1
+            self._undo_placements(forced)
+            return
+
+        # Skip pieces committed by propagation and empty pieces
+        pieces = self.puzzle_pieces_definitions
+        while piece_idx_to_place < len(pieces) and piece_idx_to_place not in legal:
+            piece_idx_to_place += 1
+
+        if piece_idx_to_place == len(pieces):
+            solution = Solution(self.placed_placement_ids)
+            self.solutions.append(solution)
+            if self.search_stats['first_solution_time'] is None:
+                self.search_stats['first_solution_time'] = time.perf_counter() - self._solve_start_time
+            if self.solution_callback is not None:
+                self.solution_callback(solution)
+            self._undo_placements(forced)
+            return
+
+        # Legal placements come from propagation, in row/column/variation order
+        self.search_stack.append(SearchFrame(forced, piece_idx_to_place, legal[piece_idx_to_place]))
+
+    def _run_search(self, checkpoint_path=None, checkpoint_interval=CHECKPOINT_INTERVAL):
+        """
+        Iterative backtracking search over self.search_stack.
+        The board always equals the forced and current placements of the stack
+        frames, so the search can be checkpointed between iterations.
+        Returns True if the search stopped at MAX_SOLUTIONS.
+        """
+        stack = self.search_stack
+        search_stats = self.search_stats
+        next_checkpoint = time.perf_counter() + checkpoint_interval
+        progress_callback = self.progress_callback
+        next_progress = time.perf_counter() + self.progress_interval
+
+        # Defer Ctrl+C to the top of the loop, where the stack and board agree
+        interrupted = []
+        previous_sigint_handler = None
+        if (checkpoint_path is not None and threading.current_thread() is threading.main_thread()
+                and signal.getsignal(signal.SIGINT) is not signal.SIG_IGN):
+            previous_sigint_handler = signal.signal(signal.SIGINT, lambda signum, frame: interrupted.append(signum))
+
+        try:
+            while stack:
+                if len(self.solutions) >= self.MAX_SOLUTIONS:
+                    return True
+                if checkpoint_path is not None and time.perf_counter() >= next_checkpoint:
+                    self.save_checkpoint(checkpoint_path)
+                    next_checkpoint = time.perf_counter() + checkpoint_interval
+                if interrupted:
+                    # Keep the progress of an interrupted run
+                    self.save_checkpoint(checkpoint_path)
+                    raise KeyboardInterrupt
+                if self.stop_requested:
+                    return False
+                if progress_callback is not None and time.perf_counter() >= next_progress:
+                    search_stats['solve_time'] = time.perf_counter() - self._solve_start_time
+                    progress_callback(dict(search_stats))
+                    next_progress = time.perf_counter() + self.progress_interval
+
+                frame = stack[-1]
+                piece_idx = frame.piece_idx
+                if frame.current is not None:
+                    # The subtree below the current placement is done
+                    self._place_or_remove_placement(piece_idx, frame.current, False)
+                    frame.current = None
+
+                legal = frame.legal
+                while frame.next_pos < len(legal):
+                    placement_id = legal[frame.next_pos]
+                    frame.next_pos += 1
+                    self._place_or_remove_placement(piece_idx, placement_id, True)
+                    search_stats['nodes'] += 1
+                    if self._is_valid_pruning_candidate():
+                        frame.current = placement_id
+                        break
+                    self._place_or_remove_placement(piece_idx, placement_id, False)
+                    search_stats['backtracks'] += 1
+
+                if frame.current is None:
+                    stack.pop()
+                    self._undo_placements(frame.forced)
+                else:
+                    self._expand_node(piece_idx + 1)
+        finally:
+            if previous_sigint_handler is not None:
+                signal.signal(signal.SIGINT, previous_sigint_handler)
+
+        return len(self.solutions) >= self.MAX_SOLUTIONS
+
+    def save_checkpoint(self, path):
+        """
+        Write the search state (stack, solutions and counters) to path.
+        """
+        search_stats = dict(self.search_stats)
+        search_stats['solve_time'] = time.perf_counter() - self._solve_start_time
+        checkpoint = {
+            'version': CHECKPOINT_VERSION,
+            'definition_hash': self.definition.definition_hash,
+            'target_cells': list(self.target_cells_coords),
+            'max_solutions': self.MAX_SOLUTIONS,
+            'frames': [frame.to_tuple() for frame in self.search_stack],
+            'solutions': [solution.placement_ids for solution in self.solutions],
+            'search_stats': search_stats,
+        }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def _load_checkpoint(self, path):
+        """
+        Restore the search state saved by save_checkpoint.
+        Returns False if there is no usable checkpoint for the current puzzle and targets.
+        """
+        try:
+            with open(path, "rb") as f:
+                checkpoint = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return False
+        if (not isinstance(checkpoint, dict)
+                or checkpoint.get('version') != CHECKPOINT_VERSION
+                or checkpoint.get('definition_hash') != self.definition.definition_hash
+                or sorted(checkpoint.get('target_cells', [])) != sorted(self.target_cells_coords)
+                or checkpoint.get('max_solutions') != self.MAX_SOLUTIONS):
+            return False
+
+        # Replay the placements of every frame to rebuild the board
+        self._reset_board()
+        self.search_stack = [SearchFrame(*frame) for frame in checkpoint['frames']]
+        for frame in self.search_stack:
+            for piece_idx, placement_id in frame.forced:
+                self._place_or_remove_placement(piece_idx, placement_id, True)
+            if frame.current is not None:
+                self._place_or_remove_placement(frame.piece_idx, frame.current, True)
+        self.solutions = [Solution(placement_ids) for placement_ids in checkpoint['solutions']]
+        self.search_stats = checkpoint['search_stats']
+        self._solve_start_time = time.perf_counter() - self.search_stats['solve_time']
+        return True
+
+    def solve(self, checkpoint_path=None, checkpoint_interval=CHECKPOINT_INTERVAL, remove_checkpoint=True):
         """
         Attempt to solve the puzzle.
+        With checkpoint_path, the search state is saved there every checkpoint_interval
+        seconds (and on Ctrl+C) and a matching checkpoint is resumed, which sets
+        resumed_from_checkpoint. Once the search finishes the file is removed, or with
+        remove_checkpoint=False holds the final state, so a caller can delete it only
+        after storing the result.
         """
         if len(self.target_cells_coords) != self.max_target_cells:
-            self.current_status_message = "Select: month, day, weekday"
+            self.current_status_message = self._selection_prompt()
             return False
 
         # Reset board while keeping restricted and target cells
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if (r, c) not in self.target_cells_coords and (r, c) not in RESTRICTED_CELLS:
-                    self.board[r][c] = self.EMPTY_CELL
+        self._reset_board()
 
-        self.placed_pieces_info = {}
         self.is_solved_state = False
         self.solutions = []
         self.current_solution_index = -1
 
         self.current_status_message = "Attempting to solve... (this may take a moment)"
-        pygame.event.pump()
+        if pygame.display.get_init() and threading.current_thread() is threading.main_thread():
+            pygame.event.pump()
+
+        self.resumed_from_checkpoint = checkpoint_path is not None and self._load_checkpoint(checkpoint_path)
+        if not self.resumed_from_checkpoint:
+            self.search_stats = self._new_search_stats()
+            self._solve_start_time = time.perf_counter()
+            self.search_stack = []
+            self._expand_node(0)
+
+        self._run_search(checkpoint_path, checkpoint_interval)
+        if checkpoint_path is not None:
+            # A stopped search keeps its checkpoint so it can be resumed
+            if remove_checkpoint and not self.stop_requested:
+                if os.path.exists(checkpoint_path):
+                    os.remove(checkpoint_path)
+            else:
+                self.save_checkpoint(checkpoint_path)
+        self.search_stats['solve_time'] = time.perf_counter() - self._solve_start_time
+        self.stop_requested = False
+
+        return self._show_solve_result()
+
+    def request_stop(self):
+        """
+        Ask a running solve() (e.g. in another thread) to stop at the next search step.
+        The solutions found so far are kept.
+        """
+        self.stop_requested = True
 
-        if self._solve_recursive(0):
+    def load_solutions(self, solutions, search_stats=None):
+        """
+        Show solutions computed elsewhere (e.g. by a SolutionPrefetcher) for the
+        current target cells, as if solve() had found them.
+        """
+        if len(self.target_cells_coords) != self.max_target_cells:
+            self.current_status_message = self._selection_prompt()
+            return False
+
+        self._reset_board()
+        self.solutions = list(solutions)
+        self.current_solution_index = -1
+        self.search_stats = dict(search_stats) if search_stats else self._new_search_stats()
+        return self._show_solve_result()
+
+    def _show_solve_result(self):
+        """Show the first solution found, or report that there is none."""
+        # _run_search only reports True when MAX_SOLUTIONS is reached, so check the solutions found
+        if self.solutions:
             self.is_solved_state = True
-            if self.solutions:
-                self.current_solution_index = 0
-                self._apply_solution(self.solutions[0])
-                self.current_status_message = f"Solution 1/{len(self.solutions)}. \nPress 'N' for next solution, \n'P' for previous solution, \n'R' to restart."
-            else:
-                self.current_status_message = "No solution found. \nTry different target cells or press 'R' to restart."
+            self.current_solution_index = 0
+            self._apply_solution(self.solutions[0])
+            self.current_status_message = f"Solution 1/{len(self.solutions)}. \nPress 'N' for next solution, \n'P' for previous solution, \n'R' to restart."
         else:
             self.is_solved_state = False
             self.current_status_message = "No solution found. \nTry different target cells or press 'R' to restart."
@@ -357,25 +649,36 @@ class CalendarPuzzle:
 
     def _reset_board(self):
         """Reset the board while keeping restricted and target cells."""
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if (r, c) in self.target_cells_coords:
-                    self.board[r][c] = self.TARGET_CELL
-                elif (r, c) in RESTRICTED_CELLS:
-                    self.board[r][c] = self.RESTRICTED_CELL
-                else:
-                    self.board[r][c] = self.EMPTY_CELL
-        self.placed_pieces_info = {}
+        for row, template_row in zip(self.board, self.board_template):
+            row[:] = template_row
+        for r, c in self.target_cells_coords:
+            self.board[r][c] = self.TARGET_CELL
+        self.placed_placement_ids = [None] * len(self.puzzle_pieces_definitions)
+        self.applied_solution = None
+        self.occupied_mask = self.restricted_mask
+        for r, c in self.target_cells_coords:
+            self.occupied_mask |= 1 << (r * self.cols + c)
 
     def _apply_solution(self, solution):
         """
         Apply a solution to the board.
+        When switching from another solution only the pieces that moved are redrawn.
         """
-        self._reset_board()
-        self.placed_pieces_info = solution.copy()
-        for piece_idx, piece_info in solution.items():
-            for r, c in piece_info['coords_on_board']:
-                self.board[r][c] = piece_info['id_on_board']
+        if self.applied_solution is None:
+            self._reset_board()
+            changed = [i for i, placement_id in enumerate(solution.placement_ids) if placement_id is not None]
+        else:
+            previous_ids = self.applied_solution.placement_ids
+            changed = [i for i, placement_id in enumerate(solution.placement_ids) if placement_id != previous_ids[i]]
+            # Clear every moved piece first so new placements are not overwritten
+            for piece_idx in changed:
+                if previous_ids[piece_idx] is not None:
+                    self._place_or_remove_placement(piece_idx, previous_ids[piece_idx], False)
+
+        for piece_idx in changed:
+            if solution.placement_ids[piece_idx] is not None:
+                self._place_or_remove_placement(piece_idx, solution.placement_ids[piece_idx], True)
+        self.applied_solution = solution
 
     def show_next_solution(self):
         """
@@ -405,22 +708,144 @@ class CalendarPuzzle:
         """
         Reset the game to initial state.
         """
-        # Reset board state
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if (r, c) in RESTRICTED_CELLS:
-                    self.board[r][c] = self.RESTRICTED_CELL
-                else:
-                    self.board[r][c] = self.EMPTY_CELL
-        
         # Clear all selections and game state
         self.target_cells_coords = []
         self.target_cells_types = []
-        self.placed_pieces_info = {}
+        self._reset_board()
         self.is_solved_state = False
         self.solutions = []
         self.current_solution_index = -1
-        self.current_status_message = "Select: month, day, weekday"
+        self.current_status_message = self._selection_prompt()
+
+def solve_target_cells(definition_path, target_cells, max_solutions=CalendarPuzzle.MAX_SOLUTIONS):
+    """
+    Solve for a set of target cells in a fresh puzzle.
+    Returns (solutions, search_stats); used by worker processes.
+    """
+    puzzle = CalendarPuzzle(load_puzzle_definition(definition_path))
+    puzzle.MAX_SOLUTIONS = max_solutions
+    for r, c in target_cells:
+        puzzle.toggle_target_cell(r, c)
+    puzzle.solve()
+    return puzzle.solutions, puzzle.search_stats
+
+class SolutionCache:
+    """
+    Bounded LRU cache of solve results keyed by target cells.
+    """
+    def __init__(self, max_size=SOLUTION_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = collections.OrderedDict()
+
+    @staticmethod
+    def key(target_cells):
+        return tuple(sorted(target_cells))
+
+    def get(self, target_cells):
+        """Return (solutions, search_stats) or None, marking the entry as recently used."""
+        key = self.key(target_cells)
+        if key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, target_cells, result):
+        key = self.key(target_cells)
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def __contains__(self, target_cells):
+        return self.key(target_cells) in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+class SolutionPrefetcher:
+    """
+    Solves target-cell sets speculatively in worker processes and keeps the
+    results in a SolutionCache, so the game can show them without waiting.
+    Requests wait here until a worker is free, so every solve handed to the
+    pool has really started and a queued one can still be dropped.
+    """
+    def __init__(self, definition, max_workers=PREFETCH_WORKERS, cache_size=SOLUTION_CACHE_SIZE):
+        self.definition_path = definition.source_path
+        self.cache = SolutionCache(cache_size)
+        self.max_workers = max_workers
+        self.queued = collections.deque()  # Cache keys waiting for a free worker, oldest first
+        self.running = {}  # Cache key -> AsyncResult of a solve a worker has started
+        self.hover_keys = collections.deque()  # Queued hover requests, oldest first
+        self.pool = multiprocessing.Pool(max_workers)
+
+    def request(self, target_cells, hover=False):
+        """
+        Start solving target_cells in the background unless already cached, queued or running.
+        Only the newest hover requests are kept; older ones that have not started are dropped.
+        """
+        key = SolutionCache.key(target_cells)
+        if key in self.cache or key in self.running or key in self.queued:
+            return
+        self.queued.append(key)
+        if hover:
+            self.hover_keys.append(key)
+            while len(self.hover_keys) > MAX_PENDING_HOVER_PREFETCHES:
+                self.queued.remove(self.hover_keys.popleft())
+        self._dispatch()
+
+    def _dispatch(self):
+        """Hand queued requests to the pool while it has idle workers."""
+        while self.queued and len(self.running) < self.max_workers:
+            key = self.queued.popleft()
+            if key in self.hover_keys:
+                self.hover_keys.remove(key)
+            self.running[key] = self.pool.apply_async(solve_target_cells, (self.definition_path, key))
+
+    def collect(self):
+        """Move finished background results into the cache and start queued requests."""
+        for key, result in list(self.running.items()):
+            if result.ready():
+                del self.running[key]
+                if result.successful():
+                    self.cache.put(key, result.get())
+        self._dispatch()
+
+    def get(self, target_cells):
+        """
+        Return (solutions, search_stats) for target_cells, waiting for a background
+        solve that has already started. Returns None if it was never requested or is
+        still queued; the queued request is then dropped so the caller can solve it.
+        """
+        self.collect()
+        key = SolutionCache.key(target_cells)
+        result = self.cache.get(key)
+        if result is not None:
+            return result
+        if key in self.queued:
+            # Solving locally is faster than waiting for the workers to reach it
+            self.queued.remove(key)
+            if key in self.hover_keys:
+                self.hover_keys.remove(key)
+            return None
+        async_result = self.running.get(key)
+        if async_result is None:
+            return None
+        try:
+            result = async_result.get()
+        except Exception as e:
+            print(f"Background solve failed: {e}")
+            return None
+        finally:
+            del self.running[key]
+            self._dispatch()
+        self.cache.put(key, result)
+        return result
+
+    def shutdown(self):
+        """Drop queued work and terminate solves still running; their results are only speculative."""
+        self.queued.clear()
+        self.hover_keys.clear()
+        self.pool.terminate()
 
 def draw_board(screen, puzzle, font, label_font):
     """
@@ -482,7 +907,7 @@ def draw_board(screen, puzzle, font, label_font):
                 current_tile_color = RESTRICTED_CELL_COLOR
             elif cell_value > 0:  # Piece
                 piece_idx = cell_value - 1
-                current_tile_color = PIECE_COLORS[piece_idx] if 0 <= piece_idx < len(PIECE_COLORS) else TILE_COLOR
+                current_tile_color = BASE_PIECE_COLORS[piece_idx % len(BASE_PIECE_COLORS)] if piece_idx >= 0 else TILE_COLOR
             else:  # EMPTY_CELL
                 current_tile_color = EMPTY_TILE_COLOR
 
@@ -493,30 +918,40 @@ def draw_board(screen, puzzle, font, label_font):
                 pygame.draw.rect(screen, TEXT_COLOR, tile_rect, 1)
 
             # Draw label
-            if (r, c) in CELL_LABELS and CELL_LABELS[(r, c)]:
-                label_text = CELL_LABELS[(r, c)]
+            if puzzle.cell_labels.get((r, c)):
+                label_text = puzzle.cell_labels[(r, c)]
                 label_surface = label_font.render(label_text, True, LABEL_TEXT_COLOR)
                 label_rect = label_surface.get_rect(center=tile_rect.center)
                 screen.blit(label_surface, label_rect)
 
-def get_game_config():
+def get_date_config(date):
     """
-    Get the current date configuration.
+    Get the (month, day, weekday) configuration of a date.
     """
-    today = datetime.datetime.now()
-    current_month = today.month
-    current_day = today.day
-    current_weekday = today.weekday()  # 0-6, where 0 is Monday
+    weekday = date.weekday()  # 0-6, where 0 is Monday
     
     # Convert weekday to our format (0-6, where 0 is Sunday)
     weekday_map = {0: 1, 1: 2, 2: 3, 3: 4, 4: 5, 5: 6, 6: 0}
-    current_weekday = weekday_map[current_weekday]
     
-    return current_month, current_day, current_weekday
+    return date.month, date.day, weekday_map[weekday]
+
+def get_game_config():
+    """
+    Get the current date configuration.
+    """
+    return get_date_config(datetime.datetime.now())
+
+def select_date_cells(puzzle, month, day, weekday):
+    """
+    Select the target cells for a date (weekday 0-6, where 0 is Sunday).
+    """
+    for r, c in puzzle.definition.date_to_target_cells(month, day, weekday):
+        puzzle.toggle_target_cell(r, c)
 
-def main():
+def main(definition_path=None):
     """
     Main entry point for the puzzle game.
+    definition_path selects a puzzle variant; the classic calendar is used by default.
     """
     current_month, current_day, current_weekday = get_game_config()
 
@@ -524,25 +959,10 @@ def main():
     pygame.font.init()
 
     try:
-        puzzle = CalendarPuzzle()
+        puzzle = CalendarPuzzle(load_puzzle_definition(definition_path))
         
         # Auto-select current date cells
-        month_row = (current_month - 1) // 6
-        month_col = (current_month - 1) % 6
-        puzzle.toggle_target_cell(month_row, month_col)
-        
-        day_row = (current_day - 1) // 7 + 2
-        day_col = (current_day - 1) % 7
-        puzzle.toggle_target_cell(day_row, day_col)
-        
-        if current_weekday <= 3:  # Sun, Mon, Tues, Wed
-            weekday_row = 6
-            weekday_col = current_weekday + 3
-        else:  # Thur, Fri, Sat
-            weekday_row = 7
-            weekday_col = current_weekday
-        
-        puzzle.toggle_target_cell(weekday_row, weekday_col)
+        select_date_cells(puzzle, current_month, current_day, current_weekday)
         
     except Exception as e:
         print(f"Error initializing puzzle: {e}")
@@ -561,6 +981,15 @@ def main():
     font = pygame.font.Font(None, font_size)
     label_font = pygame.font.Font(None, label_font_size)
 
+    # Start solving today's date, then the next few days, in the background
+    prefetcher = SolutionPrefetcher(puzzle.definition)
+    prefetcher.request(puzzle.target_cells_coords)
+    today = datetime.date.today()
+    for days_ahead in range(1, PREFETCH_DAYS + 1):
+        upcoming_config = get_date_config(today + datetime.timedelta(days=days_ahead))
+        prefetcher.request(puzzle.definition.date_to_target_cells(*upcoming_config))
+    hovered_cell = None
+
     def handle_keyboard_events(event):
         """
         Handle keyboard input events.
@@ -571,31 +1000,22 @@ def main():
                 puzzle.reset_game()
                 
                 # Re-select current date cells after reset
-                month_row = (current_month - 1) // 6
-                month_col = (current_month - 1) % 6
-                puzzle.toggle_target_cell(month_row, month_col)
-                
-                day_row = (current_day - 1) // 7 + 2
-                day_col = (current_day - 1) % 7
-                puzzle.toggle_target_cell(day_row, day_col)
-                
-                if current_weekday <= 3:  # Sun, Mon, Tues, Wed
-                    weekday_row = 6
-                    weekday_col = current_weekday + 3
-                else:  # Thur, Fri, Sat
-                    weekday_row = 7
-                    weekday_col = current_weekday
-                
-                puzzle.toggle_target_cell(weekday_row, weekday_col)
+                select_date_cells(puzzle, current_month, current_day, current_weekday)
                 print("Game reset. Current date selected.")
 
         elif event.key == pygame.K_s:
             if not puzzle.is_solved_state:
                 if len(puzzle.target_cells_coords) == puzzle.max_target_cells:
                     print("Attempting to solve puzzle...")
-                    puzzle.solve()
+                    # Use the background result if there is one (waiting only if it is already running)
+                    result = prefetcher.get(puzzle.target_cells_coords)
+                    if result is not None:
+                        puzzle.load_solutions(*result)
+                    else:
+                        puzzle.solve()
+                        prefetcher.cache.put(puzzle.target_cells_coords, (puzzle.solutions, puzzle.search_stats))
                 else:
-                    puzzle.current_status_message = "Select: month, day, weekday"
+                    puzzle.current_status_message = puzzle._selection_prompt()
                     print(puzzle.current_status_message)
         
         elif event.key == pygame.K_n:  # Next solution
@@ -606,31 +1026,57 @@ def main():
             if puzzle.is_solved_state:
                 puzzle.show_previous_solution()
 
-    def handle_mouse_click(pos):
+    def get_cell_at(pos):
         """
-        Handle mouse click events.
+        Return the (row, col) of the board cell at a screen position, or None.
         """
         mouse_x, mouse_y = pos
         # Adjust for info area height
         adjusted_y = mouse_y - INFO_HEIGHT
         
-        if adjusted_y < 0:  # Clicked in info area
-            return
+        if adjusted_y < 0:  # Position in info area
+            return None
             
         # Calculate grid position
-        clicked_c = (mouse_x - MARGIN) // (TILE_SIZE + MARGIN)
-        clicked_r = (adjusted_y - MARGIN) // (TILE_SIZE + MARGIN)
+        c = (mouse_x - MARGIN) // (TILE_SIZE + MARGIN)
+        r = (adjusted_y - MARGIN) // (TILE_SIZE + MARGIN)
         
         # Validate grid position
-        if not (0 <= clicked_r < puzzle.rows and 0 <= clicked_c < puzzle.cols):
+        if not (0 <= r < puzzle.rows and 0 <= c < puzzle.cols):
+            return None
+        return r, c
+
+    def handle_mouse_click(pos):
+        """
+        Handle mouse click events.
+        """
+        cell = get_cell_at(pos)
+        if cell is None:
             return
+        clicked_r, clicked_c = cell
             
         if not puzzle.is_solved_state:
             puzzle.toggle_target_cell(clicked_r, clicked_c)
         else:
             puzzle.current_status_message = f"Solution {puzzle.current_solution_index + 1}/{len(puzzle.solutions)}. \nPress 'N' for next solution, \n'P' for previous solution, \n'R' to restart."
 
+    def handle_mouse_motion(pos):
+        """
+        Prefetch the selection the hovered cell would complete.
+        """
+        nonlocal hovered_cell
+        cell = get_cell_at(pos)
+        if cell == hovered_cell:
+            return
+        hovered_cell = cell
+        if cell is None or puzzle.is_solved_state:
+            return
+        target_cells = puzzle.preview_target_cells(*cell)
+        if target_cells is not None:
+            prefetcher.request(target_cells, hover=True)
+
     # Main game loop
+    clock = pygame.time.Clock()
     running = True
     while running:
         for event in pygame.event.get():
@@ -646,11 +1092,20 @@ def main():
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 handle_mouse_click(event.pos)
 
+            # Handle mouse hover events
+            if event.type == pygame.MOUSEMOTION and PREFETCH_HOVER:
+                handle_mouse_motion(event.pos)
+
+        prefetcher.collect()
         draw_board(screen, puzzle, font, label_font)
         pygame.display.flip()
+        # Cap the frame rate so the background solvers get the CPU
+        clock.tick(60)
 
+    prefetcher.shutdown()
     pygame.quit()
     sys.exit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    multiprocessing.freeze_support()  # Needed for worker processes in the PyInstaller build
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
\ No newline at end of file
@@ -0,0 +1,366 @@
+import argparse
+import concurrent.futures
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import signal
+import statistics
+import sys
+
+from calendar_puzzle import CHECKPOINT_INTERVAL, CalendarPuzzle
+from puzzle_definition import CELL_TYPE_DAY, CELL_TYPE_MONTH, CELL_TYPE_WEEKDAY, load_puzzle_definition
+
+RECORD_FIELDS = [
+    "month", "day", "weekday", "label",
+    "solutions", "truncated", "nodes", "backtracks",
+    "first_solution_ms", "solve_ms",
+    "max_solutions", "definition_hash",
+]
+INT_FIELDS = {"month", "day", "weekday", "solutions", "nodes", "backtracks", "max_solutions"}
+FLOAT_FIELDS = {"first_solution_ms", "solve_ms"}
+
+# Upper bounds of the solution-count histogram buckets
+HISTOGRAM_BUCKETS = [0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500]
+
+
+def get_triples(definition):
+    """
+    Every (month, day, weekday) triple of the board, 1-based month and day,
+    weekday 0-6 where 0 is Sunday. Types missing from the board are None.
+    """
+    ranges = []
+    for cell_type in (CELL_TYPE_MONTH, CELL_TYPE_DAY, CELL_TYPE_WEEKDAY):
+        count = len(definition.date_cells.get(cell_type, ()))
+        ranges.append(range(count) if count else [None])
+    for month_idx, day_idx, weekday in itertools.product(*ranges):
+        yield (
+            month_idx + 1 if month_idx is not None else None,
+            day_idx + 1 if day_idx is not None else None,
+            weekday,
+        )
+
+
+def _triple_cells(definition, triple):
+    month, day, weekday = triple
+    cells = []
+    for cell_type, index in ((CELL_TYPE_MONTH, month - 1 if month else None),
+                             (CELL_TYPE_DAY, day - 1 if day else None),
+                             (CELL_TYPE_WEEKDAY, weekday)):
+        if index is not None:
+            cells.append(definition.date_cells[cell_type][index])
+    return cells
+
+
+def _checkpoint_path(checkpoint_dir, triple):
+    if checkpoint_dir is None:
+        return None
+    checkpoint_name = "-".join("x" if value is None else str(value) for value in triple)
+    return os.path.join(checkpoint_dir, f"{checkpoint_name}.ckpt")
+
+
+# Per-process state, set up once by _init_worker
+_worker_definition = None
+_worker_max_solutions = None
+_worker_checkpoint_dir = None
+_worker_checkpoint_interval = CHECKPOINT_INTERVAL
+_worker_stop_event = None
+
+
+def _init_worker(definition_path, max_solutions, checkpoint_dir, checkpoint_interval, stop_event):
+    global _worker_definition, _worker_max_solutions, _worker_checkpoint_dir, _worker_checkpoint_interval
+    global _worker_stop_event
+    # Ctrl+C is handled by the parent, which sets stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_definition = load_puzzle_definition(definition_path)
+    _worker_max_solutions = max_solutions
+    _worker_checkpoint_dir = checkpoint_dir
+    _worker_checkpoint_interval = checkpoint_interval
+    _worker_stop_event = stop_event
+
+
+def _analyze_triple(triple):
+    """
+    Solve one triple and return (record, resumed_from_checkpoint), or None if the run was stopped.
+    """
+    if _worker_stop_event.is_set():
+        return None
+
+    puzzle = CalendarPuzzle(_worker_definition)
+    puzzle.MAX_SOLUTIONS = _worker_max_solutions or float('inf')
+    cells = _triple_cells(_worker_definition, triple)
+    for r, c in cells:
+        puzzle.toggle_target_cell(r, c)
+
+    # Poll the stop event between search steps; a stopped search keeps its checkpoint
+    puzzle.progress_callback = lambda search_stats: _worker_stop_event.is_set() and puzzle.request_stop()
+
+    # The final checkpoint is kept until the parent has written the record
+    checkpoint_path = _checkpoint_path(_worker_checkpoint_dir, triple)
+    puzzle.solve(checkpoint_path, _worker_checkpoint_interval, remove_checkpoint=False)
+    if _worker_stop_event.is_set():
+        return None
+
+    stats = puzzle.search_stats
+    first_solution_time = stats['first_solution_time']
+    record = {
+        "month": triple[0],
+        "day": triple[1],
+        "weekday": triple[2],
+        "label": " ".join(_worker_definition.cell_labels[cell] for cell in cells),
+        "solutions": len(puzzle.solutions),
+        "truncated": bool(_worker_max_solutions) and len(puzzle.solutions) >= _worker_max_solutions,
+        "nodes": stats['nodes'],
+        "backtracks": stats['backtracks'],
+        "first_solution_ms": round(first_solution_time * 1000, 3) if first_solution_time is not None else None,
+        "solve_ms": round(stats['solve_time'] * 1000, 3),
+        "max_solutions": _worker_max_solutions or 0,
+        "definition_hash": _worker_definition.definition_hash,
+    }
+    return record, puzzle.resumed_from_checkpoint
+
+
+def _parse_csv_record(row):
+    record = {}
+    for field in RECORD_FIELDS:
+        value = row.get(field)
+        if value is None:
+            return None  # Truncated row from an interrupted run
+        if field in INT_FIELDS:
+            record[field] = int(value) if value != "" else None
+        elif field in FLOAT_FIELDS:
+            record[field] = float(value) if value != "" else None
+        elif field == "truncated":
+            record[field] = value == "True"
+        else:
+            record[field] = value
+    return record
+
+
+def _trim_partial_line(path):
+    """Drop a partially written last line left behind by an interrupted run."""
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def read_records(path):
+    """
+    Read the records already written to a CSV or JSON Lines report.
+    """
+    if not os.path.exists(path):
+        return []
+    _trim_partial_line(path)
+    records = []
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if _is_csv(path):
+            for row in csv.DictReader(f):
+                record = _parse_csv_record(row)
+                if record is not None:
+                    records.append(record)
+        else:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return records
+
+
+def _is_csv(path):
+    return path.lower().endswith(".csv")
+
+
+def _record_key(record):
+    return record["month"], record["day"], record["weekday"]
+
+
+def _check_resumable(path, records, definition_hash, max_solutions):
+    """
+    Raise ValueError if the records already in path were made with another
+    layout, puzzle definition or solution limit, so a resumed run cannot mix them.
+    """
+    if _is_csv(path) and os.path.exists(path) and os.path.getsize(path) > 0:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            header = next(csv.reader(f), [])
+        if header != RECORD_FIELDS:
+            raise ValueError(f"{path} was written by another version of this report; use a new file")
+    for record in records:
+        if record.get("definition_hash") != definition_hash:
+            raise ValueError(f"{path} was made for a different puzzle definition; use a new file")
+        if record.get("max_solutions") != max_solutions:
+            raise ValueError(f"{path} was made with --max-solutions {record.get('max_solutions')}, "
+                             f"not {max_solutions}; use a new file")
+
+
+def run_report(output_path, definition_path=None, max_solutions=None, workers=None,
+               checkpoint_dir=None, checkpoint_interval=CHECKPOINT_INTERVAL):
+    """
+    Analyze every triple not yet in output_path, appending each record as it completes.
+    Raises ValueError if output_path holds records for another definition or max_solutions.
+    With checkpoint_dir, searches still running are checkpointed there and resumed.
+    Returns all records, including those from earlier runs.
+    """
+    definition = load_puzzle_definition(definition_path)
+    records = read_records(output_path)
+    _check_resumable(output_path, records, definition.definition_hash, max_solutions or 0)
+    done = {_record_key(record) for record in records}
+    pending = [triple for triple in get_triples(definition) if triple not in done]
+    total = len(done) + len(pending)
+    if done:
+        print(f"Resuming: {len(done)}/{total} triples already in {output_path}")
+
+    if not pending:
+        return records
+
+    if checkpoint_dir is not None:
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
+    write_header = _is_csv(output_path) and (not os.path.exists(output_path) or os.path.getsize(output_path) == 0)
+    with open(output_path, "a", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=RECORD_FIELDS) if _is_csv(output_path) else None
+        if write_header:
+            writer.writeheader()
+
+        stop_event = multiprocessing.Event()
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                                    initargs=(definition_path, max_solutions, checkpoint_dir,
+                                                              checkpoint_interval, stop_event)) as executor:
+            futures = [executor.submit(_analyze_triple, triple) for triple in pending]
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    result = future.result()
+                    if result is None:
+                        continue
+                    record, resumed = result
+                    if writer is not None:
+                        writer.writerow(record)
+                    else:
+                        f.write(json.dumps(record) + "\n")
+                    f.flush()
+                    records.append(record)
+                    checkpoint_path = _checkpoint_path(checkpoint_dir, _record_key(record))
+                    if checkpoint_path is not None and os.path.exists(checkpoint_path):
+                        os.remove(checkpoint_path)
+                    print(f"[{len(records)}/{total}] {record['label']}: {record['solutions']} solutions, "
+                          f"{record['nodes']} nodes, {record['solve_ms']:.0f} ms"
+                          f"{' (resumed from checkpoint)' if resumed else ''}")
+            except KeyboardInterrupt:
+                # Running searches stop and keep their checkpoints; queued triples are dropped
+                print("Interrupted, stopping workers...")
+                stop_event.set()
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+
+    return records
+
+
+def summarize(records, top=10):
+    """
+    Summary statistics: hardest and easiest triples, unsolvable triples and a
+    histogram of solution counts.
+    """
+    solvable = [r for r in records if r["solutions"] > 0]
+    by_effort = sorted(solvable, key=lambda r: (r["nodes"], r["solve_ms"]))
+
+    histogram = {bucket: 0 for bucket in HISTOGRAM_BUCKETS}
+    overflow = 0
+    for record in records:
+        for bucket in HISTOGRAM_BUCKETS:
+            if record["solutions"] <= bucket:
+                histogram[bucket] += 1
+                break
+        else:
+            overflow += 1
+
+    histogram_rows = []
+    lower = 0
+    for bucket in HISTOGRAM_BUCKETS:
+        bucket_label = str(bucket) if lower == bucket else f"{lower}-{bucket}"
+        histogram_rows.append({"solutions": bucket_label, "triples": histogram[bucket]})
+        lower = bucket + 1
+    histogram_rows.append({"solutions": f">{HISTOGRAM_BUCKETS[-1]}", "triples": overflow})
+
+    nodes = [r["nodes"] for r in records]
+    return {
+        "triples": len(records),
+        "solvable": len(solvable),
+        "truncated": sum(1 for r in records if r["truncated"]),
+        "unsolvable": [r["label"] for r in records if r["solutions"] == 0],
+        "hardest": [{"label": r["label"], "nodes": r["nodes"], "solutions": r["solutions"]} for r in by_effort[::-1][:top]],
+        "easiest": [{"label": r["label"], "nodes": r["nodes"], "solutions": r["solutions"]} for r in by_effort[:top]],
+        "nodes_mean": statistics.mean(nodes) if nodes else 0,
+        "nodes_median": statistics.median(nodes) if nodes else 0,
+        "solve_ms_total": sum(r["solve_ms"] for r in records),
+        "histogram": histogram_rows,
+    }
+
+
+def print_summary(summary):
+    print(f"\nTriples analyzed: {summary['triples']} ({summary['solvable']} solvable, "
+          f"{len(summary['unsolvable'])} unsolvable, {summary['truncated']} hit the solution limit)")
+    print(f"Search nodes: mean {summary['nodes_mean']:.0f}, median {summary['nodes_median']:.0f}; "
+          f"total solve time {summary['solve_ms_total'] / 1000:.1f}s")
+
+    print("\nHardest:")
+    for entry in summary["hardest"]:
+        print(f"  {entry['label']:<20} {entry['nodes']:>10} nodes, {entry['solutions']} solutions")
+    print("\nEasiest:")
+    for entry in summary["easiest"]:
+        print(f"  {entry['label']:<20} {entry['nodes']:>10} nodes, {entry['solutions']} solutions")
+
+    if summary["unsolvable"]:
+        print("\nUnsolvable:")
+        print("  " + ", ".join(summary["unsolvable"]))
+
+    print("\nSolution count histogram:")
+    max_count = max((row["triples"] for row in summary["histogram"]), default=0)
+    for row in summary["histogram"]:
+        bar = "#" * (round(40 * row["triples"] / max_count) if max_count else 0)
+        print(f"  {row['solutions']:>9} {row['triples']:>6} {bar}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Record solution counts and search effort for every (month, day, weekday) triple.")
+    parser.add_argument("output", help="report file, .csv or .jsonl; an existing file is resumed")
+    parser.add_argument("--max-solutions", type=int, default=0,
+                        help="stop each search after this many solutions (default: 0, count all)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--puzzle", default=None, help="puzzle definition file (default: classic calendar)")
+    parser.add_argument("--checkpoint-dir", default=None,
+                        help="checkpoint searches still running to this directory and resume them on restart")
+    parser.add_argument("--checkpoint-interval", type=float, default=CHECKPOINT_INTERVAL,
+                        help=f"seconds between checkpoints (default: {CHECKPOINT_INTERVAL})")
+    parser.add_argument("--summary", default=None, help="also write the summary to this JSON file")
+    parser.add_argument("--summary-only", action="store_true", help="summarize the existing report without solving")
+    args = parser.parse_args()
+
+    if args.summary_only:
+        records = read_records(args.output)
+    else:
+        try:
+            records = run_report(args.output, args.puzzle, args.max_solutions, args.workers,
+                                 args.checkpoint_dir, args.checkpoint_interval)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        except KeyboardInterrupt:
+            print(f"Stopped. Run again with {args.output} to resume.")
+            sys.exit(130)
+
+    if not records:
+        print("No records to summarize.")
+        sys.exit(1)
+
+    summary = summarize(records)
+    print_summary(summary)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import os
+
+# Render without a window; must be set before pygame initializes its display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import concurrent.futures
+import datetime
+import time
+
+import pygame
+
+from calendar_puzzle import (
+    BASE_PIECE_COLORS,
+    EMPTY_TILE_COLOR,
+    INFO_AREA_BACKGROUND_COLOR,
+    INFO_AREA_TEXT_COLOR,
+    INFO_HEIGHT,
+    LABEL_TEXT_COLOR,
+    MARGIN,
+    RESTRICTED_CELL_COLOR,
+    SCREEN_BACKGROUND_COLOR,
+    TARGET_CELL_COLOR,
+    TEXT_COLOR,
+    TILE_SIZE,
+    CalendarPuzzle,
+    get_date_config,
+    select_date_cells,
+)
+from puzzle_definition import load_puzzle_definition
+
+FONT_SIZE = 24
+LABEL_FONT_SIZE = 28
+
+
+class SolutionRenderer:
+    """
+    Renders boards to surfaces with the same layout and colors as draw_board,
+    blitting pre-rendered tile and label sprites instead of drawing per cell.
+    """
+    def __init__(self, definition):
+        self.definition = definition
+        self.width = definition.cols * (TILE_SIZE + MARGIN) + MARGIN
+        self.height = definition.rows * (TILE_SIZE + MARGIN) + MARGIN + INFO_HEIGHT
+        self.font = pygame.font.Font(None, FONT_SIZE)
+        label_font = pygame.font.Font(None, LABEL_FONT_SIZE)
+
+        # Tile sprites keyed by board cell value
+        self.tile_sprites = {
+            CalendarPuzzle.EMPTY_CELL: self._make_tile(EMPTY_TILE_COLOR, True),
+            CalendarPuzzle.TARGET_CELL: self._make_tile(TARGET_CELL_COLOR, True),
+            CalendarPuzzle.RESTRICTED_CELL: self._make_tile(RESTRICTED_CELL_COLOR, False),
+        }
+        for piece_idx in range(len(definition.pieces)):
+            color = BASE_PIECE_COLORS[piece_idx % len(BASE_PIECE_COLORS)]
+            self.tile_sprites[piece_idx + 1] = self._make_tile(color, True)
+
+        # Label sprites with their blit positions, centered in each tile
+        self.label_sprites = []
+        for (r, c), label_text in definition.cell_labels.items():
+            if not label_text:
+                continue
+            label_surface = label_font.render(label_text, True, LABEL_TEXT_COLOR)
+            label_rect = label_surface.get_rect(center=self._tile_rect(r, c).center)
+            self.label_sprites.append((label_surface, label_rect.topleft))
+
+        # Static background: screen color plus empty info area
+        self.background = pygame.Surface((self.width, self.height))
+        self.background.fill(SCREEN_BACKGROUND_COLOR)
+        pygame.draw.rect(self.background, INFO_AREA_BACKGROUND_COLOR, pygame.Rect(0, 0, self.width, INFO_HEIGHT))
+
+    def _tile_rect(self, r, c):
+        rect_x = c * (TILE_SIZE + MARGIN) + MARGIN
+        rect_y = r * (TILE_SIZE + MARGIN) + MARGIN + INFO_HEIGHT
+        return pygame.Rect(rect_x, rect_y, TILE_SIZE, TILE_SIZE)
+
+    def _make_tile(self, color, bordered):
+        tile = pygame.Surface((TILE_SIZE, TILE_SIZE))
+        tile.fill(color)
+        if bordered:
+            pygame.draw.rect(tile, TEXT_COLOR, tile.get_rect(), 1)
+        return tile
+
+    def render(self, board, caption):
+        """
+        Render a board with a one-line caption in the info area.
+        """
+        surface = self.background.copy()
+        caption_surface = self.font.render(caption, True, INFO_AREA_TEXT_COLOR)
+        surface.blit(caption_surface, caption_surface.get_rect(left=10, centery=INFO_HEIGHT // 2))
+
+        blits = []
+        for r, row in enumerate(board):
+            for c, cell_value in enumerate(row):
+                blits.append((self.tile_sprites[cell_value], self._tile_rect(r, c).topleft))
+        blits.extend(self.label_sprites)
+        surface.blits(blits, False)
+        return surface
+
+
+# Per-process state, set up once by _init_worker
+_worker_definition = None
+_worker_renderer = None
+
+
+def _init_worker(definition_path):
+    global _worker_definition, _worker_renderer
+    pygame.display.init()
+    pygame.font.init()
+    _worker_definition = load_puzzle_definition(definition_path)
+    _worker_renderer = SolutionRenderer(_worker_definition)
+
+
+def _export_date(date, solutions_per_date, output_dir):
+    """
+    Solve one date and write its first solutions to PNG files.
+    Returns (date, images_written, solve_seconds, render_seconds).
+    """
+    puzzle = CalendarPuzzle(_worker_definition)
+    puzzle.MAX_SOLUTIONS = solutions_per_date
+    month, day, weekday = get_date_config(date)
+    select_date_cells(puzzle, month, day, weekday)
+
+    solve_start = time.perf_counter()
+    puzzle.solve()
+    solve_seconds = time.perf_counter() - solve_start
+
+    render_start = time.perf_counter()
+    images_written = 0
+    for i in range(len(puzzle.solutions)):
+        if i > 0:
+            puzzle.show_next_solution()
+        caption = f"{date.strftime('%a, %b %d %Y')} - Solution {i + 1}/{len(puzzle.solutions)}"
+        surface = _worker_renderer.render(puzzle.board, caption)
+        pygame.image.save(surface, os.path.join(output_dir, f"{date.isoformat()}_{i + 1}.png"))
+        images_written += 1
+    render_seconds = time.perf_counter() - render_start
+
+    return date, images_written, solve_seconds, render_seconds
+
+
+def get_year_dates(year):
+    """
+    All dates of a year.
+    """
+    date = datetime.date(year, 1, 1)
+    dates = []
+    while date.year == year:
+        dates.append(date)
+        date += datetime.timedelta(days=1)
+    return dates
+
+
+def export_solutions(dates, output_dir, solutions_per_date=1, definition_path=None, workers=None):
+    """
+    Solve and render the given dates over a process pool.
+    A date that fails is reported and skipped. Returns the number of images written.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    # Compile (or load) the definition once so workers only read the cache
+    load_puzzle_definition(definition_path)
+
+    total_images = 0
+    total_render_seconds = 0.0
+    start = time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                                initargs=(definition_path,)) as executor:
+        futures = {executor.submit(_export_date, date, solutions_per_date, output_dir): date for date in dates}
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                date, images_written, _, render_seconds = future.result()
+            except Exception as e:
+                # e.g. a date the puzzle's board cannot represent
+                print(f"{futures[future].isoformat()}: failed: {e}")
+                continue
+            if images_written == 0:
+                print(f"{date.isoformat()}: no solution found")
+            total_images += images_written
+            total_render_seconds += render_seconds
+    elapsed = time.perf_counter() - start
+
+    print(f"Wrote {total_images} images for {len(dates)} dates to {output_dir} in {elapsed:.1f}s")
+    if elapsed > 0:
+        print(f"Throughput: {total_images / elapsed:.2f} images/s (including solving)")
+    if total_render_seconds > 0:
+        print(f"Rendering: {total_images / total_render_seconds:.1f} images/s per worker")
+    return total_images
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export puzzle solutions to PNG images without opening a window.")
+    parser.add_argument("dates", nargs="*", type=datetime.date.fromisoformat, help="dates to export (YYYY-MM-DD)")
+    parser.add_argument("--year", type=int, help="export every date of this year")
+    parser.add_argument("--solutions", type=int, default=1, help="solutions to export per date (default: 1)")
+    parser.add_argument("--output", default="solution_images", help="output directory (default: solution_images)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--puzzle", default=None, help="puzzle definition file (default: classic calendar)")
+    args = parser.parse_args()
+    if args.solutions < 1:
+        parser.error("--solutions must be at least 1")
+
+    dates = list(args.dates)
+    if args.year is not None:
+        dates.extend(get_year_dates(args.year))
+    if not dates:
+        dates.append(datetime.date.today())
+
+    export_solutions(dates, args.output, args.solutions, args.puzzle, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+import hashlib
+import json
+import os
+import sys
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    tomllib = None
+
+
+# Bump whenever the layout of the compiled data changes, so stale caches are rebuilt
+CACHE_FORMAT_VERSION = 2
+
+# Directory (next to the definition file) holding compiled placement tables
+CACHE_DIR_NAME = ".puzzle_cache"
+
+# Cell type constants
+CELL_TYPE_MONTH = 0
+CELL_TYPE_DAY = 1
+CELL_TYPE_WEEKDAY = 2
+
+CELL_TYPE_NAMES = {
+    CELL_TYPE_MONTH: "month",
+    CELL_TYPE_DAY: "day",
+    CELL_TYPE_WEEKDAY: "weekday",
+}
+
+# Board characters used in definition files
+BOARD_CHAR_TYPES = {
+    "M": CELL_TYPE_MONTH,
+    "D": CELL_TYPE_DAY,
+    "W": CELL_TYPE_WEEKDAY,
+    ".": None,  # Coverable cell that can never be a target
+}
+RESTRICTED_CHAR = "#"
+
+
+def _base_dir():
+    """Directory holding bundled data files (also works inside a PyInstaller build)."""
+    return getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+
+
+DEFAULT_DEFINITION_PATH = os.path.join(_base_dir(), "puzzles", "classic.json")
+
+
+class PuzzleDefinitionError(ValueError):
+    """Raised when a puzzle definition file is malformed."""
+
+
+def get_piece_variations(piece_coords):
+    """
+    Generate all unique variations (rotations and flips) of a puzzle piece.
+    """
+    variations = []
+    current_piece_normalized = list(piece_coords)
+
+    for _ in range(2):  # Original and flipped versions
+        if not current_piece_normalized:
+            if [] not in variations:
+                variations.append([])
+            continue
+
+        # Normalize the current shape
+        min_r = min(p[0] for p in current_piece_normalized)
+        min_c = min(p[1] for p in current_piece_normalized)
+        current_piece_normalized = sorted([(r - min_r, c - min_c) for r, c in current_piece_normalized])
+
+        # Generate rotations
+        for _ in range(4):
+            if current_piece_normalized not in variations:
+                variations.append(current_piece_normalized)
+
+            if not current_piece_normalized:
+                break
+
+            max_r = max(p[0] for p in current_piece_normalized)
+            rotated_piece = [(c, max_r - r) for r, c in current_piece_normalized]
+            min_r = min(p[0] for p in rotated_piece)
+            min_c = min(p[1] for p in rotated_piece)
+            current_piece_normalized = sorted([(r - min_r, c - min_c) for r, c in rotated_piece])
+
+        # Prepare for flip
+        if not piece_coords:
+            continue
+        max_c = max(p[1] for p in piece_coords)
+        current_piece_normalized = [(r, max_c - c) for r, c in piece_coords]
+
+    return variations
+
+
+def read_definition_file(path):
+    """Read a raw puzzle definition from a JSON or TOML file."""
+    if path.lower().endswith(".toml"):
+        if tomllib is None:
+            raise PuzzleDefinitionError("TOML puzzle definitions require Python 3.11+ (tomllib)")
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def definition_hash(raw_definition):
+    """Stable hash of a raw definition, used as the cache key."""
+    canonical = json.dumps(raw_definition, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{CACHE_FORMAT_VERSION}:{canonical}".encode("utf-8")).hexdigest()
+
+
+def compile_definition(raw_definition):
+    """
+    Compile a raw definition into the data the game and solver use at runtime:
+    cell-type map, piece variations and every legal placement of every piece.
+    """
+    board_rows = raw_definition.get("board")
+    if not board_rows or not all(isinstance(row, str) for row in board_rows):
+        raise PuzzleDefinitionError("'board' must be a non-empty list of strings")
+    rows = len(board_rows)
+    cols = len(board_rows[0])
+    if any(len(row) != cols for row in board_rows):
+        raise PuzzleDefinitionError("all 'board' rows must have the same length")
+
+    restricted_cells = []
+    cell_types = []
+    for r, row in enumerate(board_rows):
+        type_row = []
+        for c, ch in enumerate(row):
+            if ch == RESTRICTED_CHAR:
+                restricted_cells.append((r, c))
+                type_row.append(None)
+            elif ch in BOARD_CHAR_TYPES:
+                type_row.append(BOARD_CHAR_TYPES[ch])
+            else:
+                raise PuzzleDefinitionError(f"unknown board character {ch!r} at ({r}, {c})")
+        cell_types.append(tuple(type_row))
+
+    labels = raw_definition.get("labels", [])
+    cell_labels = {}
+    for r in range(rows):
+        for c in range(cols):
+            label = labels[r][c] if r < len(labels) and c < len(labels[r]) else ""
+            cell_labels[(r, c)] = str(label)
+
+    # Cells of each type in row-major order: index i is the i-th month / day / weekday
+    date_cells = {}
+    for r in range(rows):
+        for c in range(cols):
+            cell_type = cell_types[r][c]
+            if cell_type is not None:
+                date_cells.setdefault(cell_type, []).append((r, c))
+    target_types = tuple(sorted(date_cells))
+
+    pieces = []
+    piece_names = []
+    for i, piece in enumerate(raw_definition.get("pieces", [])):
+        cells = piece.get("cells") if isinstance(piece, dict) else piece
+        if cells is None:
+            raise PuzzleDefinitionError(f"piece {i} has no 'cells'")
+        pieces.append([tuple(cell) for cell in cells])
+        piece_names.append(piece.get("name", f"P{i + 1}") if isinstance(piece, dict) else f"P{i + 1}")
+    if not pieces:
+        raise PuzzleDefinitionError("definition has no 'pieces'")
+
+    # Placements are listed in the solver's scan order: row offset, column offset, variation
+    restricted_set = set(restricted_cells)
+    piece_variations = []
+    piece_placements = []
+    for piece_coords in pieces:
+        variations = get_piece_variations(piece_coords)
+        placements = []
+        for r_offset in range(rows):
+            for c_offset in range(cols):
+                for variation_coords in variations:
+                    if not variation_coords:
+                        continue
+                    cells = tuple((r_offset + pr, c_offset + pc) for pr, pc in variation_coords)
+                    if any(not (0 <= r < rows and 0 <= c < cols) or (r, c) in restricted_set for r, c in cells):
+                        continue
+                    mask = 0
+                    for r, c in cells:
+                        mask |= 1 << (r * cols + c)
+                    placements.append((cells, mask))
+        piece_variations.append(variations)
+        piece_placements.append(placements)
+
+    return {
+        "version": CACHE_FORMAT_VERSION,
+        "name": raw_definition.get("name", "Calendar puzzle"),
+        "rows": rows,
+        "cols": cols,
+        "restricted_cells": restricted_cells,
+        "cell_labels": cell_labels,
+        "cell_types": cell_types,
+        "target_types": target_types,
+        "date_cells": date_cells,
+        "pieces": pieces,
+        "piece_names": piece_names,
+        "piece_variations": piece_variations,
+        "piece_placements": piece_placements,
+    }
+
+
+class CompiledPuzzle:
+    """
+    Read-only view of a compiled puzzle definition.
+    """
+    def __init__(self, data, definition_hash_value=None, source_path=None):
+        self.name = data["name"]
+        self.rows = data["rows"]
+        self.cols = data["cols"]
+        self.restricted_cells = data["restricted_cells"]
+        self.cell_labels = data["cell_labels"]
+        self.cell_types = data["cell_types"]
+        self.target_types = data["target_types"]
+        self.date_cells = data["date_cells"]
+        self.pieces = data["pieces"]
+        self.piece_names = data["piece_names"]
+        self.piece_variations = data["piece_variations"]
+        self.piece_placements = data["piece_placements"]
+        self.definition_hash = definition_hash_value
+        self.source_path = source_path
+
+    def get_cell_type(self, r, c):
+        """Return the cell type at (r, c), or None if it can never be a target."""
+        return self.cell_types[r][c]
+
+    def date_to_target_cells(self, month, day, weekday):
+        """
+        Map a date to its target cells.
+        month is 1-12, day is 1-31, weekday is 0-6 where 0 is Sunday.
+        Cell types missing from the board (e.g. weekday-less editions) are skipped.
+        """
+        target_cells = []
+        for cell_type, index in ((CELL_TYPE_MONTH, month - 1),
+                                 (CELL_TYPE_DAY, day - 1),
+                                 (CELL_TYPE_WEEKDAY, weekday)):
+            cells = self.date_cells.get(cell_type)
+            if cells is None:
+                continue
+            if not 0 <= index < len(cells):
+                raise PuzzleDefinitionError(f"board has no {CELL_TYPE_NAMES[cell_type]} cell #{index + 1}")
+            target_cells.append(cells[index])
+        return target_cells
+
+
+def _cache_path(definition_path, hash_value):
+    base_name = os.path.splitext(os.path.basename(definition_path))[0]
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(definition_path)), CACHE_DIR_NAME)
+    return os.path.join(cache_dir, f"{base_name}-{hash_value[:16]}.json")
+
+
+def _cells(cells):
+    return [tuple(cell) for cell in cells]
+
+
+def _encode_cache_data(data):
+    """Convert compiled data to plain JSON values (tuple dict keys become lists)."""
+    encoded = dict(data)
+    encoded["cell_labels"] = [[r, c, label] for (r, c), label in data["cell_labels"].items()]
+    encoded["date_cells"] = [[cell_type, cells] for cell_type, cells in data["date_cells"].items()]
+    return encoded
+
+
+def _decode_cache_data(encoded):
+    """Rebuild the tuples and dicts of compile_definition() from cached JSON values."""
+    data = dict(encoded)
+    data["restricted_cells"] = _cells(encoded["restricted_cells"])
+    data["cell_labels"] = {(r, c): label for r, c, label in encoded["cell_labels"]}
+    data["cell_types"] = [tuple(row) for row in encoded["cell_types"]]
+    data["target_types"] = tuple(encoded["target_types"])
+    data["date_cells"] = {cell_type: _cells(cells) for cell_type, cells in encoded["date_cells"]}
+    data["pieces"] = [_cells(piece) for piece in encoded["pieces"]]
+    data["piece_variations"] = [[_cells(variation) for variation in variations]
+                                for variations in encoded["piece_variations"]]
+    data["piece_placements"] = [[(tuple(_cells(cells)), mask) for cells, mask in placements]
+                                for placements in encoded["piece_placements"]]
+    return data
+
+
+def _read_cache(cache_path, hash_value):
+    # The cache is plain JSON, so a file shipped next to a definition can't run code;
+    # anything unreadable or malformed is simply recompiled
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if not isinstance(cached, dict) or cached.get("hash") != hash_value:
+            return None
+        encoded = cached.get("data")
+        if not isinstance(encoded, dict) or encoded.get("version") != CACHE_FORMAT_VERSION:
+            return None
+        return _decode_cache_data(encoded)
+    except Exception:
+        return None
+
+
+def _write_cache(cache_path, hash_value, data):
+    # A read-only install simply runs without a cache
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"hash": hash_value, "data": _encode_cache_data(data)}, f, separators=(",", ":"))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+_loaded_definitions = {}
+
+
+def load_puzzle_definition(path=None, use_cache=True):
+    """
+    Load a puzzle definition, compiling it only if no up-to-date cache exists.
+    """
+    path = os.path.abspath(path or DEFAULT_DEFINITION_PATH)
+    raw_definition = read_definition_file(path)
+    hash_value = definition_hash(raw_definition)
+
+    if (path, hash_value) in _loaded_definitions:
+        return _loaded_definitions[(path, hash_value)]
+
+    cache_path = _cache_path(path, hash_value)
+    data = _read_cache(cache_path, hash_value) if use_cache else None
+    if data is None:
+        data = compile_definition(raw_definition)
+        if use_cache:
+            _write_cache(cache_path, hash_value, data)
+
+    compiled = CompiledPuzzle(data, hash_value, path)
+    _loaded_definitions[(path, hash_value)] = compiled
+    return compiled
+
+
+if __name__ == "__main__":
+    # Pre-compile the given definitions (or the default one)
+    for definition_path in sys.argv[1:] or [DEFAULT_DEFINITION_PATH]:
+        compiled = load_puzzle_definition(definition_path)
+        placement_count = sum(len(p) for p in compiled.piece_placements)
+        print(f"{definition_path}: {compiled.name}, {compiled.rows}x{compiled.cols}, "
+              f"{len(compiled.pieces)} pieces, {placement_count} placements, hash {compiled.definition_hash[:16]}")
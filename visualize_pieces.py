@@ -1,19 +1,17 @@
 import pygame
 import sys
 
-# Try to import puzzle definitions and colors from calendar_puzzle.py
-# If calendar_puzzle.py has complex initialization or execution logic, this may need adjustment
-# For example, move PUZZLE_PIECES and PIECE_COLORS to a shared configuration file
+from puzzle_definition import load_puzzle_definition
+
+# Try to import piece colors from calendar_puzzle.py
 try:
-    from calendar_puzzle import PUZZLE_PIECES, PIECE_COLORS
+    from calendar_puzzle import get_piece_colors
 except ImportError as e:
     print(f"Error importing from calendar_puzzle: {e}")
-    print("Please ensure calendar_puzzle.py is in the same directory or Python path,")
-    print("and that PUZZLE_PIECES and PIECE_COLORS are defined at the top level.")
-    # Fallback definitions if import fails, so the script can partially run for structure check
-    PUZZLE_PIECES = [[(0,0), (0,1), (1,0)]] # Example piece
-    PIECE_COLORS = [(255,0,0)] # Example color
-    # sys.exit()
+    print("Please ensure calendar_puzzle.py is in the same directory or Python path.")
+    # Fallback palette if import fails, so the script can still run
+    def get_piece_colors(num_pieces):
+        return [(255, 0, 0)] * num_pieces
 
 # --- Pygame Settings ---
 SCREEN_BACKGROUND_COLOR = (200, 200, 200)  # Light gray background
@@ -81,16 +79,16 @@ def draw_single_piece(screen, piece_coords, piece_color, top_left_x, top_left_y,
     render_height_px = piece_height_tiles * TILE_SIZE + (piece_height_tiles-1) * MARGIN if piece_height_tiles > 0 else 0
     return render_width_px, render_height_px
 
-def main():
+def main(definition_path=None):
     pygame.init()
     pygame.font.init()
 
-    if 'PUZZLE_PIECES' not in globals() or 'PIECE_COLORS' not in globals():
-        print("PUZZLE_PIECES or PIECE_COLORS not loaded. Exiting.")
-        pygame.quit()
-        sys.exit()
+    # Pieces come from the compiled puzzle definition (classic calendar by default)
+    definition = load_puzzle_definition(definition_path)
+    puzzle_pieces = definition.pieces
+    piece_colors = get_piece_colors(len(puzzle_pieces))
 
-    num_pieces = len(PUZZLE_PIECES)
+    num_pieces = len(puzzle_pieces)
     if num_pieces == 0:
         print("No puzzle pieces to display.")
         pygame.quit()
@@ -102,7 +100,7 @@ def main():
 
     # Pre-calculate rendering sizes of all puzzle pieces to better plan layout
     piece_render_sizes = [] # List of (width_px, height_px) for each piece
-    for i, piece_coords in enumerate(PUZZLE_PIECES):
+    for i, piece_coords in enumerate(puzzle_pieces):
         if not piece_coords:
             piece_render_sizes.append((0,0))
             continue
@@ -157,7 +155,7 @@ def main():
     final_screen_height = max(temp_current_y + row_max_height_px, 300) # Ensure minimum height
 
     screen = pygame.display.set_mode((final_screen_width, final_screen_height))
-    pygame.display.set_caption("Puzzle Pieces Visualization - Corrected")
+    pygame.display.set_caption(f"Puzzle Pieces Visualization - {definition.name}")
 
     running = True
     while running:
@@ -167,10 +165,10 @@ def main():
 
         screen.fill(SCREEN_BACKGROUND_COLOR)
 
-        for i, piece_coords_orig in enumerate(PUZZLE_PIECES):
+        for i, piece_coords_orig in enumerate(puzzle_pieces):
             if not piece_coords_orig: continue
 
-            piece_color = PIECE_COLORS[i % len(PIECE_COLORS)]
+            piece_color = piece_colors[i % len(piece_colors)]
             pos_idx, pos_x, pos_y, _, _ = positions[i]
             
             # Call draw_single_piece, it now handles normalization and returns rendering size
@@ -183,4 +181,4 @@ def main():
     sys.exit()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
\ No newline at end of file